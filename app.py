@@ -1,17 +1,92 @@
 import streamlit as st
 import os
-import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
 from dotenv import load_dotenv
+import hashlib
+import io
 import json
-import re
-import tempfile
 import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# The SDK converts response schemas through pydantic, which rejects typing.TypedDict before Python 3.12
+import typing_extensions as typing
+
+try:
+    import orjson
+except ImportError:  # Optional; fall back to the standard library parser
+    orjson = None
 
 # Load environment variables
 load_dotenv()
 
 # --- Configuration ---
+MODEL_NAME = "gemini-2.5-flash"
+# Short transcripts go to the faster lite tier; Pro is only used when opted into
+LITE_MODEL_NAME = "gemini-2.5-flash-lite"
+PRO_MODEL_NAME = "gemini-2.5-pro"
+LITE_MAX_PAGES = 5
+# Bump whenever the prompt changes so cached analyses from the old prompt are not reused
+PROMPT_VERSION = 3
+# Finished analyses are reused for this many seconds, keeping at most this many
+ANALYSIS_CACHE_TTL = 3600
+ANALYSIS_CACHE_MAX_ENTRIES = 100
+# Uploaded PDFs are reused for this many seconds (Gemini itself keeps them 48 h), keeping at most this many
+UPLOAD_CACHE_TTL = 24 * 3600
+UPLOAD_CACHE_MAX_ENTRIES = 100
+# Concurrent uploads across all sessions before new ones queue
+UPLOAD_WORKERS = 8
+# API keys whose clients are kept alive; pre-warming a mistyped key must not pile up clients
+MAX_CACHED_KEYS = 32
+# Seconds to wait for Gemini to finish processing an uploaded PDF
+FILE_PROCESSING_TIMEOUT = 60
+
+# Safety settings to prevent blocking of financial risks
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"}
+]
+
+# Structured output schema; Gemini is constrained to emit exactly this JSON shape
+class KeyMetrics(typing.TypedDict):
+    revenue: str
+    ebitda: str
+    net_profit: str
+    order_book: str
+    margin_guidance: str
+
+class TranscriptAnalysis(typing.TypedDict):
+    sentiment: str
+    confidence_score: int
+    summary: str
+    positives: list[str]
+    negatives: list[str]
+    outlook: str
+    key_metrics: KeyMetrics
+
+# Persona and rules live in the system instruction; the per-request prompt stays short
+SYSTEM_INSTRUCTION = """
+You are a Senior Equity Research Analyst analyzing scanned earnings call transcripts.
+OCR the document and identify the Key Financial Metrics (Revenue, EBITDA, Net Profit, Order Book/Backlog).
+Compare the 'Tone' of the Management with the 'Tone' of the Analysts in the Q&A.
+Extract any specific 'Guidance' or 'Outlook' numbers provided for the next fiscal year.
+Use only the document. Report "N/A" for any metric that is not stated.
+"""
+
+ANALYSIS_PROMPT = (
+    "Analyze this earnings call. sentiment: Strong Bullish / Bullish / Neutral / Bearish / Strong Bearish; "
+    "confidence_score: 1-100; summary: 3 sentences on the business trajectory; "
+    "positives and negatives: at least 3 specific tailwinds and risks each, with data points; "
+    "outlook: management's numerical or strategic guidance."
+)
+
+GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": TranscriptAnalysis,
+}
+
 st.set_page_config(
     page_title="Earnings Call AI Analyst",
     page_icon="💰",
@@ -34,102 +109,284 @@ with st.sidebar:
     st.divider()
     st.markdown("### 🛠️ System Status")
     st.info("Mode: **Professional Analyst**")
-    st.caption("Model: `gemini-2.5-flash`")
+    use_pro = st.checkbox("Use Gemini 2.5 Pro (slower, deeper analysis)")
+    if use_pro:
+        st.caption(f"Model: `{PRO_MODEL_NAME}`")
+    else:
+        st.caption(f"Model: `{LITE_MODEL_NAME}` (≤{LITE_MAX_PAGES} pages) / `{MODEL_NAME}`")
     st.caption("Safety: `Disabled`")
     st.caption("Input: `Native PDF Upload`")
 
 # --- Helper Functions ---
 
-def analyze_transcript_multimodal(file_path, api_key, progress_bar=None):
-    """Analyzes the PDF directly using Gemini 2.5 Flash Multimodal capabilities with streaming progress."""
+@st.cache_resource
+def get_analysis_cache():
+    """Shared store of finished analyses, keyed by (PDF SHA-256, Pro toggle, prompt version).
+
+    Not st.cache_data, since the analysis streams into UI elements created outside the
+    function, which cache_data cannot replay. Entries are (stored_at, result), oldest first.
+    """
+    return threading.Lock(), OrderedDict()
+
+def get_cached_analysis(cache_key):
+    """Returns a stored analysis younger than ANALYSIS_CACHE_TTL, or None."""
+    lock, entries = get_analysis_cache()
+    with lock:
+        entry = entries.get(cache_key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > ANALYSIS_CACHE_TTL:
+            del entries[cache_key]
+            return None
+        return result
+
+def store_analysis(cache_key, result):
+    """Stores an analysis, evicting the oldest entries beyond ANALYSIS_CACHE_MAX_ENTRIES."""
+    lock, entries = get_analysis_cache()
+    with lock:
+        entries[cache_key] = (time.monotonic(), result)
+        entries.move_to_end(cache_key)
+        while len(entries) > ANALYSIS_CACHE_MAX_ENTRIES:
+            entries.popitem(last=False)
+
+def count_pages(pdf_bytes):
+    """Returns the PDF's page count from its page tree (no text extraction), or None if unreadable."""
+    from pypdf import PdfReader
+
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        # Safety Settings
-        # Safety settings to prevent blocking of financial risks
-        safety_settings = [
-            {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"}
-        ]
-
-        # 1. Upload file to Gemini
-        gemini_file = genai.upload_file(file_path, mime_type="application/pdf")
+        return len(PdfReader(io.BytesIO(pdf_bytes)).pages)
+    except Exception:
+        return None
+
+def pick_model(n_pages, use_pro=False):
+    """Chooses the model tier for a document: lite for short transcripts, flash otherwise."""
+    if use_pro:
+        return PRO_MODEL_NAME
+    if n_pages is not None and n_pages <= LITE_MAX_PAGES:
+        return LITE_MODEL_NAME
+    return MODEL_NAME
+
+# genai.configure() is process-global, so concurrent sessions with different keys would swap it
+# under each other. Each key gets its own clients instead and genai.configure is never called.
+@st.cache_resource(max_entries=MAX_CACHED_KEYS, show_spinner=False)
+def get_file_client(api_key):
+    """File API client bound to `api_key` (the SDK's subclass, which adds uploads)."""
+    # Imported lazily so the first page render doesn't wait on the SDK's gRPC stack
+    from google.generativeai.client import FileServiceClient
+    return FileServiceClient(client_options={"api_key": api_key})
+
+@st.cache_resource(max_entries=MAX_CACHED_KEYS, show_spinner=False)
+def get_generative_client(api_key):
+    """Generation client bound to `api_key`."""
+    import google.ai.generativelanguage as glm
+    return glm.GenerativeServiceClient(client_options={"api_key": api_key})
+
+@st.cache_resource(max_entries=3 * MAX_CACHED_KEYS, show_spinner=False)
+def get_model(api_key, model_name=MODEL_NAME):
+    """Reuses one model handle per API key and model tier across reruns."""
+    import google.generativeai as genai
+    model = genai.GenerativeModel(model_name, system_instruction=SYSTEM_INSTRUCTION)
+    # Bind the key's own client; otherwise the model picks up the process-global default on first use
+    model._client = get_generative_client(api_key)
+    return model
+
+@st.cache_resource
+def get_upload_executor():
+    """Thread pool for PDF uploads, sized so concurrent sessions don't queue behind each other."""
+    return ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="gemini-upload")
+
+@st.cache_resource(show_spinner=False)
+def get_background_executor():
+    """Separate pool for fire-and-forget work (warm-ups, deletes) that nobody waits on."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="gemini-background")
+
+@st.cache_resource
+def get_upload_cache():
+    """Gemini uploads shared across sessions, keyed by (API key hash, PDF SHA-256).
+
+    `entries` holds (stored_at, file name, file client), oldest first. `holders` counts the
+    analyses currently using each file, and `retired` keeps files that have left `entries`
+    (expired, replaced or failed) until their last holder releases them, when they are deleted.
+    """
+    return threading.Lock(), OrderedDict(), {}, {}
+
+def _retire_upload_locked(upload_cache, cache_key):
+    """Drops a cache entry and deletes its file now if unused, else once its last holder is done."""
+    _, entries, holders, retired = upload_cache
+    _, file_name, file_client = entries.pop(cache_key)
+    if holders.get(file_name):
+        retired[file_name] = file_client
+    else:
+        get_background_executor().submit(_safe_delete, file_client, file_name)
+
+def _expire_uploads_locked(upload_cache):
+    """Retires entries older than UPLOAD_CACHE_TTL and the oldest ones beyond UPLOAD_CACHE_MAX_ENTRIES."""
+    _, entries, _, _ = upload_cache
+    now = time.monotonic()
+    for cache_key in [k for k, (stored_at, _, _) in entries.items() if now - stored_at > UPLOAD_CACHE_TTL]:
+        _retire_upload_locked(upload_cache, cache_key)
+    while len(entries) > UPLOAD_CACHE_MAX_ENTRIES:
+        _retire_upload_locked(upload_cache, next(iter(entries)))
+
+def discard_upload(upload_cache, cache_key, file_name):
+    """Stops reusing an unusable file; it is deleted once no session holds it any more."""
+    lock, entries, _, _ = upload_cache
+    with lock:
+        entry = entries.get(cache_key)
+        if entry and entry[1] == file_name:
+            _retire_upload_locked(upload_cache, cache_key)
+
+def release_upload(upload_cache, file_name):
+    """Hands back a file obtained from _reuse_or_upload, deleting it if it was retired meanwhile."""
+    lock, _, holders, retired = upload_cache
+    with lock:
+        holders[file_name] -= 1
+        if holders[file_name] == 0:
+            del holders[file_name]
+            file_client = retired.pop(file_name, None)
+            if file_client is not None:
+                get_background_executor().submit(_safe_delete, file_client, file_name)
+
+def _reuse_or_upload(upload_cache, cache_key, file_client, pdf_bytes, file_name):
+    """Returns the Gemini file for these PDF bytes, reusing an earlier upload while it is still usable.
+
+    The file is held for the caller, who must hand it back with release_upload().
+    """
+    lock, entries, holders, _ = upload_cache
+    with lock:
+        _expire_uploads_locked(upload_cache)
+        entry = entries.get(cache_key)
+        if entry:
+            holders[entry[1]] = holders.get(entry[1], 0) + 1
+
+    if entry:
+        cached_name = entry[1]
+        try:
+            gemini_file = file_client.get_file(name=cached_name)
+            if gemini_file.state.name in ("ACTIVE", "PROCESSING"):
+                return gemini_file
+        except Exception:
+            pass  # Expired or deleted on Gemini's side; upload again
+        discard_upload(upload_cache, cache_key, cached_name)
+        release_upload(upload_cache, cached_name)
+
+    gemini_file = file_client.create_file(
+        path=io.BytesIO(pdf_bytes), mime_type="application/pdf", display_name=file_name
+    )
+    with lock:
+        if cache_key in entries:
+            # Another session uploaded the same PDF meanwhile; this upload replaces it
+            _retire_upload_locked(upload_cache, cache_key)
+        entries[cache_key] = (time.monotonic(), gemini_file.name, file_client)
+        holders[gemini_file.name] = holders.get(gemini_file.name, 0) + 1
+        _expire_uploads_locked(upload_cache)
+    return gemini_file
+
+def _safe_delete(file_client, file_name):
+    """Deletes a Gemini file, ignoring errors; meant to run off the script thread."""
+    try:
+        file_client.delete_file(name=file_name)
+    except Exception:
+        pass
+
+def upload_cache_key(api_key, pdf_hash):
+    """Key for get_upload_cache; uploaded files belong to the key's project, so the key is part of it."""
+    return hashlib.sha256(api_key.encode()).hexdigest(), pdf_hash
+
+def start_upload(pdf_bytes, upload_key, file_name, api_key):
+    """Starts uploading the PDF to Gemini in the background and returns a Future of the file handle."""
+    return get_upload_executor().submit(
+        _reuse_or_upload, get_upload_cache(), upload_key, get_file_client(api_key), pdf_bytes, file_name
+    )
+
+def _warm(api_key):
+    """Imports the SDK and makes cheap calls so this key's generation and file clients are connected.
+
+    Only the key's own clients are touched, so warming (even a mistyped key) never changes what
+    other sessions' in-flight analyses run against.
+    """
+    try:
+        get_model(api_key).count_tokens("ping")
+        next(iter(get_file_client(api_key).list_files(request={"page_size": 1})), None)
+    except Exception:
+        pass  # Warm-up is best effort; real errors surface on Analyze
+
+@st.cache_resource(max_entries=MAX_CACHED_KEYS, show_spinner=False)
+def prewarm_connection(api_key):
+    """Warms the Gemini connection in the background once per API key."""
+    # Everything, including the SDK import, runs on the worker so the script thread never waits
+    return get_background_executor().submit(_warm, api_key)
+
+def parse_json(text):
+    """Parses the model's JSON output, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def analyze_transcript_multimodal(upload, upload_key, api_key, model_name=MODEL_NAME, status=None, preview=None):
+    """Analyzes the PDF directly using Gemini's Multimodal capabilities with streaming progress.
+
+    `status` (st.status) is relabelled once the file is ready and generation starts. If a
+    `preview` placeholder (st.empty) is given, the tail of the streamed output is rendered
+    into it as chunks arrive. JSON is only parsed once the stream completes.
+    """
+    gemini_file = None
+    try:
+        # 1. Wait for the background upload (see start_upload) to finish
+        gemini_file = upload.result()
+
+        model = get_model(api_key, model_name)
+        file_client = get_file_client(api_key)
         
-        # 2. Wait for processing (usually instant for PDFs)
+        # 2. Wait for processing (usually instant for PDFs), backing off from 50 ms up to 1 s
+        delay = 0.05
+        deadline = time.monotonic() + FILE_PROCESSING_TIMEOUT
         while gemini_file.state.name == "PROCESSING":
-            time.sleep(1)
-            gemini_file = genai.get_file(gemini_file.name)
+            if time.monotonic() > deadline:
+                discard_upload(get_upload_cache(), upload_key, gemini_file.name)
+                raise TimeoutError(f"Gemini is still processing the PDF after {FILE_PROCESSING_TIMEOUT}s.")
+            time.sleep(delay)
+            delay = min(delay * 1.7, 1.0)
+            gemini_file = file_client.get_file(name=gemini_file.name)
 
         if gemini_file.state.name == "FAILED":
-             raise ValueError("Gemini failed to process the PDF file.")
+            # Unusable upload: stop reusing it; it is deleted in the background once no session holds it
+            discard_upload(get_upload_cache(), upload_key, gemini_file.name)
+            raise ValueError("Gemini failed to process the PDF file.")
 
-        # 3. Enhanced Prompt
-        prompt = """
-        You are a Senior Equity Research Analyst. Perform a deep-dive analysis of this scanned earnings call.
-        
-        STEP 1: OCR the document and identify the Key Financial Metrics (Revenue, EBITDA, Net Profit, Order Book/Backlog).
-        STEP 2: Analyze the 'Tone' of the Management vs. the 'Tone' of the Analysts in the Q&A.
-        STEP 3: Extract any specific 'Guidance' or 'Outlook' numbers provided for the next fiscal year.
-        
-        Provide the final analysis ONLY as a valid JSON object:
-        {
-          "sentiment": "Strong Bullish / Bullish / Neutral / Bearish / Strong Bearish",
-          "confidence_score": 1-100,
-          "summary": "A high-level 3-sentence summary of the business trajectory.",
-          "positives": ["At least 3 specific tailwinds with data points if available"],
-          "negatives": ["At least 3 specific risks or headwinds mentioned"],
-          "outlook": "Detail the management's numerical or strategic guidance for the future",
-          "key_metrics": {
-              "revenue": "Value if found",
-              "ebitda": "Value if found",
-              "net_profit": "Value if found",
-              "order_book": "Value if found",
-              "margin_guidance": "Percentage if found"
-          }
-        }
-        Do not use markdown. Return raw JSON.
-        """
-        
-        # 4. Generate Content (Prompt + File) - STREAMING for Progress
+        if status:
+            status.update(label=f"🧠 Analyzing with {model_name}...")
+
+        # 3. Generate Content (Prompt + File) - STREAMING for Progress
         response = model.generate_content(
-            [prompt, gemini_file], 
-            safety_settings=safety_settings,
+            [ANALYSIS_PROMPT, gemini_file],
+            safety_settings=SAFETY_SETTINGS,
+            generation_config=GENERATION_CONFIG,
             stream=True
         )
         
-        full_text = ""
-        current_progress = 25
-        
+        chunks = []
         for chunk in response:
             if chunk.text:
-                full_text += chunk.text
-            
-            # Increment progress bar slightly for each chunk, capped at 90%
-            if progress_bar:
-                if current_progress < 90:
-                    current_progress += 2
-                    progress_bar.progress(current_progress, text="Generative AI is analyzing...")
-                else:
-                    progress_bar.progress(90, text="Finalizing analysis...")
-        
-        # 5. Cleanup (Delete file from Gemini)
-        try:
-            gemini_file.delete()
-        except:
-            pass
+                chunks.append(chunk.text)
+                if preview:
+                    preview.code("".join(chunks)[-2000:], language="json")
+
+        full_text = "".join(chunks)
 
         if full_text:
-            cleaned_text = re.sub(r'```json\s*|\s*```', '', full_text).strip()
-            return json.loads(cleaned_text)
+            return parse_json(full_text)
         else:
             return None
 
     except Exception as e:
         # Pass the error up
         raise e
+    finally:
+        # The file stays cached for reuse; it is deleted once it expires or is replaced (see get_upload_cache)
+        if gemini_file is not None:
+            release_upload(get_upload_cache(), gemini_file.name)
 
 # --- Main UI ---
 st.title("💰 Earnings Call AI Analyst")
@@ -144,91 +401,93 @@ if uploaded_file is not None:
         else:
             # --- Checkpoint System ---
             status_container = st.status("🚀 Processing...", expanded=True)
-            progress_bar = status_container.progress(0, text="Initializing...")
-            temp_path = None
             
             try:
-                # Checkpoint 1: Uploading
-                status_container.write("📤 Uploading PDF to Gemini (Vision Mode)...")
-                progress_bar.progress(10, text="Uploading PDF...")
-                
-                # Create a temp file
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                    tmp.write(uploaded_file.getvalue())
-                    temp_path = tmp.name
-
-                if temp_path:
-                    progress_bar.progress(25, text="PDF Uploaded. Connecting to Gemini...")
-                    status_container.write("✅ Upload success. Model is 'reading' the file...")
+                pdf_bytes = uploaded_file.getvalue()
+                pdf_hash = hashlib.sha256(pdf_bytes).hexdigest()
+                # The model tier is a function of the PDF and the Pro toggle, so those stand in for it
+                cache_key = (pdf_hash, use_pro, PROMPT_VERSION)
+                result = get_cached_analysis(cache_key)
+
+                if result is None:
+                    # Checkpoint 1: Uploading. It doesn't depend on the model tier, so it starts first and
+                    # runs in the background while the page count and UI are handled
+                    upload_key = upload_cache_key(api_key, pdf_hash)
+                    upload = start_upload(pdf_bytes, upload_key, uploaded_file.name, api_key)
+                    status_container.update(label="📤 Uploading PDF to Gemini (Vision Mode)...")
+                    model_name = pick_model(count_pages(pdf_bytes), use_pro)
+
+                    # Checkpoint 2: AI Analysis; the function relabels the status and streams the preview
+                    preview = status_container.empty()
+                    result = analyze_transcript_multimodal(
+                        upload, upload_key, api_key, model_name, status_container, preview
+                    )
+                    preview.empty()
+
+                    if result:
+                        store_analysis(cache_key, result)
+                else:
+                    status_container.write("♻️ This transcript was analyzed recently. Reusing the cached analysis.")
+
+                if result:
+                    status_container.update(label="Analysis Complete!", state="complete", expanded=False)
                     
-                    # Checkpoint 2: AI Analysis
-                    status_container.write("🧠 Analyzing with **Gemini 2.5 Flash**...")
+                    # --- Professional UI ---
+                    st.divider()
+
+                    # 1. Top Level Metrics
+                    col1, col2, col3 = st.columns([1, 1, 2])
+                    col1.metric("Market Sentiment", result.get("sentiment", "N/A"))
+                    col2.metric("AI Confidence", f"{result.get('confidence_score', 0)}%")
                     
-                    # Pass progress bar to function for streaming update
-                    result = analyze_transcript_multimodal(temp_path, api_key, progress_bar)
+                    # Extract order book/metrics
+                    metrics = result.get("key_metrics", {})
+                    order_book = metrics.get("order_book", "N/A")
                     
-                    if result:
-                        progress_bar.progress(100, text="Analysis Complete!")
-                        status_container.update(label="Analysis Complete!", state="complete", expanded=False)
-                        st.balloons()
-                        
-                        # --- Professional UI ---
-                        st.divider()
-
-                        # 1. Top Level Metrics
-                        col1, col2, col3 = st.columns([1, 1, 2])
-                        col1.metric("Market Sentiment", result.get("sentiment", "N/A"))
-                        col2.metric("AI Confidence", f"{result.get('confidence_score', 0)}%")
-                        
-                        # Extract order book/metrics
-                        metrics = result.get("key_metrics", {})
-                        order_book = metrics.get("order_book", "N/A")
-                        
-                        with col3:
-                            st.markdown("### Order Book")
-                            st.markdown(f"<h1 style='font-size: 3rem; color: #4CAF50;'>{order_book}</h1>", unsafe_allow_html=True)
-
-                        # 2. Executive Summary
-                        st.subheader("📋 Strategic Executive Summary")
-                        st.info(result.get("summary", "No summary available."))
-
-                        # 3. Pros and Cons
-                        p_col, n_col = st.columns(2)
-                        with p_col:
-                            st.subheader("✅ Key Tailwinds")
-                            for p in result.get("positives", []):
-                                st.success(f"{p}")
-                                
-                        with n_col:
-                            st.subheader("⚠️ Critical Risks")
-                            for n in result.get("negatives", []):
-                                st.error(f"{n}")
-
-                        st.divider()
-
-                        # 4. Management Guidance
-                        st.subheader("🔮 Forward-Looking Guidance")
-                        st.warning(result.get("outlook", "No specific guidance provided."))
-
-                        # 5. Key Metrics Table (Extra Professional Touch)
-                        st.subheader("📊 Key Financial Metrics")
-                        st.json(metrics)
-                        
-                        # Raw Data Expander
-                        with st.expander("View Full Raw Analysis"):
-                            st.json(result)
-                    else:
-                        status_container.update(label="Analysis Failed", state="error")
+                    with col3:
+                        st.markdown("### Order Book")
+                        st.markdown(f"<h1 style='font-size: 3rem; color: #4CAF50;'>{order_book}</h1>", unsafe_allow_html=True)
+
+                    # 2. Executive Summary
+                    st.subheader("📋 Strategic Executive Summary")
+                    st.info(result.get("summary", "No summary available."))
+
+                    # 3. Pros and Cons
+                    p_col, n_col = st.columns(2)
+                    with p_col:
+                        st.subheader("✅ Key Tailwinds")
+                        for p in result.get("positives", []):
+                            st.success(f"{p}")
+                            
+                    with n_col:
+                        st.subheader("⚠️ Critical Risks")
+                        for n in result.get("negatives", []):
+                            st.error(f"{n}")
+
+                    st.divider()
+
+                    # 4. Management Guidance
+                    st.subheader("🔮 Forward-Looking Guidance")
+                    st.warning(result.get("outlook", "No specific guidance provided."))
+
+                    # 5. Key Metrics Table (Extra Professional Touch)
+                    st.subheader("📊 Key Financial Metrics")
+                    st.json(metrics)
+                    
+                    # Raw Data Expander
+                    with st.expander("View Full Raw Analysis"):
+                        st.json(result)
                 else:
-                    status_container.update(label="File Error", state="error")
+                    status_container.update(label="Analysis Failed", state="error")
             except Exception as e:
                 status_container.update(label="Error Occurred", state="error")
                 st.error(f"An error occurred: {e}")
-            finally:
-                # Local cleanup
-                if temp_path and os.path.exists(temp_path):
-                    os.unlink(temp_path)
 
     
 else:
     st.info("Please upload a PDF file to begin.")
+
+# Set up the Gemini connection while the user is still picking a file; done after the UI is
+# laid out so the page renders before any SDK work starts
+if api_key:
+    prewarm_connection(api_key)